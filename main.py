@@ -1,7 +1,6 @@
 import os
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 from supabase import create_client
@@ -12,6 +11,7 @@ import uuid
 import uvicorn
 from src.convert_to_raw_text import extract_text_from_file
 from src.scrape_web import browse_allowed_sources
+from src.static_assets import PrecompressedStaticFiles, StaticPageCache, static_url
 from datetime import datetime, timedelta
 
 load_dotenv()
@@ -32,8 +32,10 @@ if not SUPABASE_URL or not SUPABASE_ANON_KEY:
 supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
 
 app = FastAPI()
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["static_url"] = static_url
+pages = StaticPageCache(templates)
 
 
 class LoginData(BaseModel):
@@ -68,27 +70,27 @@ def get_current_user(authorization: str = Header(None)):
 
 @app.get("/", response_class=HTMLResponse)
 async def serve_login(request: Request):
-    return templates.TemplateResponse("starter.html", {"request": request})
+    return pages.response(request, "starter.html")
 
 
 @app.get("/login", response_class=HTMLResponse)
 async def serve_signup(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return pages.response(request, "index.html")
 
 
 @app.get("/signup", response_class=HTMLResponse)
 async def serve_signup(request: Request):
-    return templates.TemplateResponse("signup.html", {"request": request})
+    return pages.response(request, "signup.html")
 
 
 @app.get("/settings", response_class=HTMLResponse)
 async def serve_signup(request: Request):
-    return templates.TemplateResponse("settings.html", {"request": request})
+    return pages.response(request, "settings.html")
 
 
 @app.get("/upload", response_class=HTMLResponse)
 async def serve_uploads(request: Request):
-    return templates.TemplateResponse("upload_docs.html", {"request": request})
+    return pages.response(request, "upload_docs.html")
 
 
 @app.post("/api/login")
@@ -507,22 +509,22 @@ async def get_dashboard_stats(current_user=Depends(get_current_user)):
 
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return pages.response(request, "dashboard.html")
 
 
 @app.get("/chat", response_class=HTMLResponse)
 async def chat(request: Request):
-    return templates.TemplateResponse("chat.html", {"request": request})
+    return pages.response(request, "chat.html")
 
 
 @app.get("/topics", response_class=HTMLResponse)
 async def chat(request: Request):
-    return templates.TemplateResponse("topics.html", {"request": request})
+    return pages.response(request, "topics.html")
 
 
 @app.get("/sources", response_class=HTMLResponse)
 async def sources(request: Request):
-    return templates.TemplateResponse("add_sources.html", {"request": request})
+    return pages.response(request, "add_sources.html")
 
 @app.get("/api/sources")
 async def get_sources(current_user=Depends(get_current_user)):
@@ -0,0 +1,92 @@
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+
+# images and fonts are already compressed, gzip/brotli just wastes cpu on them
+COMPRESSIBLE = (".js", ".css", ".html", ".svg", ".json", ".txt")
+
+
+def hashed_name(name: str, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    base, ext = os.path.splitext(name)
+    return f"{base}.{digest}{ext}"
+
+
+def write_variants(path: str, data: bytes) -> dict:
+    with open(path, "wb") as f:
+        f.write(data)
+    sizes = {"raw": len(data)}
+
+    if not path.endswith(COMPRESSIBLE):
+        return sizes
+
+    # mtime=0 so the same input always builds the same .gz bytes
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + ".gz", "wb") as f:
+        f.write(gz)
+    sizes["gzip"] = len(gz)
+
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        with open(path + ".br", "wb") as f:
+            f.write(br)
+        sizes["br"] = len(br)
+
+    return sizes
+
+
+def build() -> dict:
+    # old hashed files are kept: the running server and pages already open in a
+    # browser still point at them until the server restarts with the new manifest
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    manifest = {}
+    report = {}
+
+    for root, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != DIST_DIR]
+        for file_name in sorted(files):
+            src_path = os.path.join(root, file_name)
+            name = os.path.relpath(src_path, STATIC_DIR).replace(os.sep, "/")
+
+            with open(src_path, "rb") as f:
+                data = f.read()
+
+            out_name = "dist/" + hashed_name(name, data)
+            out_path = os.path.join(STATIC_DIR, *out_name.split("/"))
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+
+            manifest[name] = out_name
+            report[name] = write_variants(out_path, data)
+
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+    return report
+
+
+if __name__ == "__main__":
+    report = build()
+    total_raw = 0
+    total_best = 0
+    for name, sizes in report.items():
+        best = min(sizes.values())
+        total_raw += sizes["raw"]
+        total_best += best
+        parts = ", ".join(f"{k}={v}" for k, v in sizes.items())
+        print(f"{name}: {parts}")
+    if brotli is None:
+        print("brotli not installed, only .gz variants were written")
+    print(f"Total bytes: {total_raw} raw -> {total_best} over the wire")
@@ -1,6 +1,14 @@
+import codecs
+import itertools
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import quote_plus
+from bs4.dammit import EncodingDetector
+from urllib.parse import quote_plus, urlparse
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
 
 DOMAIN_SEARCH = {
     "wikipedia.org": "https://en.wikipedia.org/w/index.php?search={query}",
@@ -15,27 +23,231 @@ DOMAIN_SEARCH = {
     "bbc.co.uk": "https://www.bbc.co.uk/search?q={query}"
 }
 
+# selectors are ("id" | "class" | "tag", value) so they can be matched while streaming.
+# DEFAULT_SELECTORS is the same main -> article -> body order the old code used
+DEFAULT_SELECTORS = [("tag", "main"), ("tag", "article"), ("tag", "body")]
+
+# extra containers for the DOMAIN_SEARCH result pages, tried before the defaults
+MAIN_SELECTORS = {
+    "wikipedia.org": [("id", "mw-content-text")],
+    "plato.stanford.edu": [("class", "search_results")],
+}
+
+# removed before looking for the container, like the old decompose() loop.
+# bs4 already leaves <template> contents out of get_text()
+SKIP_TAGS = {"script", "style", "nav", "footer", "header", "aside", "form", "template"}
+BOM_CODECS = {"utf-8": "utf-8-sig", "utf-16le": "utf-16", "utf-16be": "utf-16"}
+CHUNK_SIZE = 16384
+DEFAULT_ENGINE = "lxml"
+
+
+def selectors_for(url: str) -> list:
+    host = urlparse(url).hostname or ""
+    for domain, selectors in MAIN_SELECTORS.items():
+        if host == domain or host.endswith("." + domain):
+            return selectors + DEFAULT_SELECTORS
+    return DEFAULT_SELECTORS
+
+
+def _matches(el, selector) -> bool:
+    kind, value = selector
+    if kind == "tag":
+        return el.tag == value
+    if kind == "id":
+        return el.get("id") == value
+    return value in (el.get("class") or "").split()
+
+
+def _find_main(root, selectors):
+    for selector in selectors:
+        walker = etree.iterwalk(root, events=("start",))
+        for event, el in walker:
+            if not isinstance(el.tag, str):
+                continue
+            if el.tag in SKIP_TAGS:
+                walker.skip_subtree()
+            elif _matches(el, selector):
+                return el
+    return None
+
+
+def _main_text(main, max_chars=None) -> str:
+    parts = []
+    length = 0
+
+    def add(text):
+        nonlocal length
+        if text and text.strip():
+            parts.append(text.strip())
+            length += len(parts[-1]) + 1
+
+    walker = etree.iterwalk(main, events=("start", "end", "comment", "pi"))
+    for event, el in walker:
+        if event == "start":
+            if el.tag in SKIP_TAGS:
+                walker.skip_subtree()
+            else:
+                add(el.text)
+        elif el is not main:
+            add(el.tail)
+        if max_chars and length >= max_chars:
+            break
+
+    return " ".join(" ".join(parts).split())
+
+
+class PageDecoder:
+    """Decodes the response bytes for both engines, so the fallback reads the page the
+    same way the fast path did.
+
+    A charset from the header, a BOM or a <meta> in the first chunk is used as is.
+    Otherwise the page is read as UTF-8 until a byte sequence proves it isn't, and
+    from there on as windows-1252.
+    """
+
+    def __init__(self, encoding=None):
+        self.encoding = encoding
+        self.guessing = False
+        self._decoder = None
+        self._pending = b""
+
+    def _start(self, head: bytes):
+        if self.encoding is None:
+            _, bom_encoding = EncodingDetector.strip_byte_order_mark(head)
+            self.encoding = BOM_CODECS.get(bom_encoding, bom_encoding) or \
+                EncodingDetector.find_declared_encoding(head, is_html=True)
+        if self.encoding:
+            try:
+                self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+                return
+            except LookupError:
+                pass
+        self.encoding = "utf-8"
+        self.guessing = True
+
+    def decode(self, chunk: bytes, final: bool = False) -> str:
+        if self._decoder is None and not self.guessing:
+            self._start(chunk)
+        if self._decoder is not None:
+            return self._decoder.decode(chunk, final)
+
+        data = self._pending + chunk
+        self._pending = b""
+        if self.encoding != "utf-8":
+            return data.decode(self.encoding, errors="replace")
+
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            if not final and e.end == len(data) and e.reason == "unexpected end of data":
+                # a character cut in half by the chunk boundary, finish it next time
+                self._pending = data[e.start:]
+                return data[:e.start].decode("utf-8")
+            self.encoding = "windows-1252"
+            return data[:e.start].decode("utf-8") + data[e.start:].decode(self.encoding, errors="replace")
+
+
+def decode_chunks(chunks, encoding=None):
+    decoder = PageDecoder(encoding)
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def clean_text_lxml(chunks, encoding=None, selectors=DEFAULT_SELECTORS, max_chars=None) -> str:
+    """Streams the page into lxml and stops reading once the main container is
+    closed or enough text has been collected."""
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    first = selectors[0]
+    container = None
+    skipping = 0
+    collected = 0
+
+    for text in decode_chunks(chunks, encoding):
+        parser.feed(text)
+        done = False
+        for event, el in parser.read_events():
+            if el.tag in SKIP_TAGS:
+                skipping += 1 if event == "start" else -1
+            elif container is None:
+                if event == "start" and not skipping and _matches(el, first):
+                    container = el
+            elif event == "end":
+                if el is container:
+                    done = True
+                    break
+                if not skipping:
+                    collected += len(el.text or "")
+        if done or (max_chars and collected >= max_chars):
+            break
+
+    root = parser.close()
+    if root is None:
+        return ""
+    main = container if container is not None else _find_main(root, selectors)
+    if main is None:
+        return ""
+    return _main_text(main, max_chars)
+
+
+def clean_text_bs4(chunks, encoding=None, selectors=None, max_chars=None) -> str:
+    html = "".join(decode_chunks(chunks, encoding))
+    soup = BeautifulSoup(html, "html.parser")
+
+    for tag in soup(list(SKIP_TAGS)):
+        tag.decompose()
+
+    main = soup.find("main") or soup.find("article") or soup.body
+    if not main:
+        return ""
+
+    text = main.get_text(" ", strip=True)
+    return " ".join(text.split())
+
+
+ENGINES = {
+    "lxml": clean_text_lxml,
+    "bs4": clean_text_bs4,
+}
+
+
+def fetch_clean_text(url: str, max_chars: int | None = None, engine: str = DEFAULT_ENGINE) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown extraction engine: {engine}")
 
-def fetch_clean_text(url: str) -> str:
     try:
-        r = requests.get(
+        with requests.get(
             url,
             timeout=10,
-            headers={"User-Agent": "edu-rag-bot/1.0"}
-        )
-        r.raise_for_status()
+            headers={"User-Agent": "edu-rag-bot/1.0"},
+            stream=True
+        ) as r:
+            r.raise_for_status()
+
+            # requests guesses ISO-8859-1 when there is no charset, PageDecoder works it out instead
+            content_type = r.headers.get("Content-Type", "").lower()
+            encoding = r.encoding if "charset" in content_type else None
+
+            stream = r.iter_content(CHUNK_SIZE)
+            seen = []
 
-        soup = BeautifulSoup(r.text, "html.parser")
+            def tee():
+                for chunk in stream:
+                    seen.append(chunk)
+                    yield chunk
 
-        for tag in soup(["script", "style", "nav", "footer", "header", "aside", "form"]):
-            tag.decompose()
+            text = ""
+            if engine != "bs4" and etree is not None:
+                try:
+                    text = ENGINES[engine](tee(), encoding, selectors_for(url), max_chars)
+                except Exception:
+                    text = ""
 
-        main = soup.find("main") or soup.find("article") or soup.body
-        if not main:
-            return ""
+            # fall back to the old html.parser path on whatever has been read plus the rest
+            if not text:
+                text = clean_text_bs4(itertools.chain(seen, stream), encoding)
 
-        text = main.get_text(" ", strip=True)
-        return " ".join(text.split())
+        return text[:max_chars] if max_chars else text
 
     except Exception:
         return ""
@@ -53,7 +265,7 @@ def browse_allowed_sources(
         query=quote_plus(query)
     )
 
-    text = fetch_clean_text(search_url)
+    text = fetch_clean_text(search_url, max_chars=3000)
 
     if not text:
         return ""
@@ -0,0 +1,133 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+
+from fastapi import Request
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+
+from src.build_static import MANIFEST_PATH
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # build step hasn't been run, fall back to the plain files
+        return {}
+
+
+_manifest = load_manifest()
+
+
+def static_url(name: str) -> str:
+    return "/static/" + _manifest.get(name, name)
+
+
+def accepted_encodings(headers: Headers) -> set:
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        token, _, params = part.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def content_type(path: str) -> str:
+    # what FileResponse would send for the plain file, including starlette's charset on text/*
+    media_type = mimetypes.guess_type(path)[0] or "text/plain"
+    if media_type.startswith("text/"):
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def etag_matches(if_none_match: str, *etags: str) -> bool:
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        # proxies that re-compress the body hand back a weak W/"..." version of our tag
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in etags:
+            return True
+    return False
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serves the .br/.gz files written by build_static next to hashed assets."""
+
+    async def get_response(self, path: str, scope) -> Response:
+        if not path.startswith("dist/"):
+            response = await super().get_response(path, scope)
+            response.headers.setdefault("Cache-Control", REVALIDATE)
+            return response
+
+        accepted = accepted_encodings(Headers(scope=scope))
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding not in accepted:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException as exc:
+                if exc.status_code != 404:
+                    raise
+                continue
+            response.headers["Content-Encoding"] = encoding
+            if response.status_code == 200:
+                response.headers["Content-Type"] = content_type(path)
+            break
+        else:
+            response = await super().get_response(path, scope)
+
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+
+class StaticPageCache:
+    """Renders request-independent templates once and keeps the bytes in memory."""
+
+    def __init__(self, templates):
+        self.templates = templates
+        self.pages = {}
+
+    def _render(self, name: str) -> dict:
+        body = self.templates.get_template(name).render().encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        page = {
+            "body": body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+            "etag": '"' + digest + '"',
+            "gzip_etag": '"' + digest + '-gzip"',
+        }
+        self.pages[name] = page
+        return page
+
+    def response(self, request: Request, name: str) -> Response:
+        page = self.pages.get(name) or self._render(name)
+        gzipped = "gzip" in accepted_encodings(request.headers)
+        # each content-coding needs its own strong ETag
+        headers = {
+            "ETag": page["gzip_etag"] if gzipped else page["etag"],
+            "Cache-Control": REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag_matches(if_none_match, page["etag"], page["gzip_etag"]):
+            return Response(status_code=304, headers=headers)
+
+        if gzipped:
+            headers["Content-Encoding"] = "gzip"
+            return Response(page["gzip"], media_type="text/html", headers=headers)
+
+        return Response(page["body"], media_type="text/html", headers=headers)
@@ -0,0 +1,67 @@
+"""Compares the bs4 and lxml engines over tests/fixtures/html.
+
+saved/ holds real search result pages written by tests/save_fixtures.py,
+synthetic/ holds hand-made pages for edge cases (no charset, late non-ASCII bytes, ...).
+
+Run from the repo root: python -m tests.bench_scrapes
+"""
+import difflib
+import os
+import time
+
+from src.scrape_web import CHUNK_SIZE, DEFAULT_SELECTORS, clean_text_bs4, clean_text_lxml, selectors_for
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+CORPORA = ("saved", "synthetic")
+RUNS = 20
+MAX_CHARS = 3000
+
+
+def chunked(data: bytes):
+    for i in range(0, len(data), CHUNK_SIZE):
+        yield data[i:i + CHUNK_SIZE]
+
+
+def timed(fn, data, *args):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        text = fn(chunked(data), *args)
+    return (time.perf_counter() - start) / RUNS, text
+
+
+def bench(corpus: str):
+    directory = os.path.join(FIXTURES, corpus)
+    files = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+    if not files:
+        print(f"[{corpus}] no fixtures, run python -m tests.save_fixtures first")
+        return
+
+    total_old = 0
+    total_new = 0
+    for file_name in files:
+        with open(os.path.join(directory, file_name), "rb") as f:
+            data = f.read()
+        selectors = selectors_for("https://" + file_name[:-len(".html")] + "/")
+
+        old_time, old_text = timed(clean_text_bs4, data)
+        full_time, full_text = timed(clean_text_lxml, data, None, DEFAULT_SELECTORS)
+        new_time, new_text = timed(clean_text_lxml, data, None, selectors, MAX_CHARS)
+        total_old += old_time
+        total_new += new_time
+
+        similarity = difflib.SequenceMatcher(
+            None, old_text[:MAX_CHARS], new_text[:MAX_CHARS], autojunk=False
+        ).ratio()
+        print(f"[{corpus}] {file_name} ({len(data) // 1024} KB)")
+        print(f"  bs4 html.parser:      {old_time * 1000:7.2f} ms  {len(data) / old_time / 2**20:6.1f} MB/s")
+        print(f"  lxml same selectors:  {full_time * 1000:7.2f} ms  identical output: {full_text == old_text}")
+        print(f"  lxml domain + early:  {new_time * 1000:7.2f} ms  similarity to bs4 (first {MAX_CHARS} chars): {similarity:.2f}")
+        # U+FFFD means bytes were decoded with the wrong charset
+        print(f"  replacement chars:    bs4 {old_text.count(chr(0xFFFD))}, lxml {new_text.count(chr(0xFFFD))}")
+
+    print(f"[{corpus}] Total: {total_old * 1000:.1f} ms -> {total_new * 1000:.1f} ms ({total_old / total_new:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    for corpus in CORPORA:
+        bench(corpus)
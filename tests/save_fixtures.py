@@ -0,0 +1,34 @@
+"""Saves the real DOMAIN_SEARCH result pages into tests/fixtures/html/saved for the benchmark.
+
+Run from the repo root: python -m tests.save_fixtures [query]
+"""
+import os
+import sys
+from urllib.parse import quote_plus
+
+import requests
+
+from src.scrape_web import DOMAIN_SEARCH
+
+SAVED = os.path.join(os.path.dirname(__file__), "fixtures", "html", "saved")
+MAX_BYTES = 512 * 1024
+
+
+if __name__ == "__main__":
+    query = sys.argv[1] if len(sys.argv) > 1 else "physics"
+    os.makedirs(SAVED, exist_ok=True)
+
+    for domain, template in DOMAIN_SEARCH.items():
+        url = template.format(query=quote_plus(query))
+        try:
+            r = requests.get(url, timeout=10, headers={"User-Agent": "edu-rag-bot/1.0"})
+            r.raise_for_status()
+        except Exception as e:
+            print(f"{domain}: failed ({e})")
+            continue
+
+        # raw bytes as served, so the benchmark sees the real encoding too.
+        # the charset header is lost, which is the harder case for the decoder anyway
+        with open(os.path.join(SAVED, domain + ".html"), "wb") as f:
+            f.write(r.content[:MAX_BYTES])
+        print(f"{domain}: {len(r.content) // 1024} KB saved")
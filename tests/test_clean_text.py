@@ -0,0 +1,72 @@
+"""Checks that the lxml engine reads pages the same way as the bs4 fallback.
+
+Run from the repo root: python -m tests.test_clean_text (or with pytest)
+"""
+from src.scrape_web import CHUNK_SIZE, clean_text_bs4, clean_text_lxml, fetch_clean_text
+
+# ~20 KB of ASCII before the first non-ASCII byte, so the first chunk alone looks like UTF-8
+LATE_CP1252 = (
+    "<html><head><style>" + ".c{margin:0}" * 1700 + "</style></head>"
+    "<body><main><p>café naïve</p></main></body></html>"
+).encode("cp1252")
+
+
+def chunked(data: bytes):
+    for i in range(0, len(data), CHUNK_SIZE):
+        yield data[i:i + CHUNK_SIZE]
+
+
+def both(data: bytes, encoding=None):
+    return clean_text_lxml(chunked(data), encoding), clean_text_bs4(chunked(data), encoding)
+
+
+def test_encodings():
+    assert len(LATE_CP1252) > CHUNK_SIZE
+    cases = [
+        ("<html><body><p>café naïve</p></body></html>".encode("utf-8"), None),
+        ("\ufeff<html><body><p>café naïve</p></body></html>".encode("utf-8"), None),
+        ('<html><head><meta charset="windows-1252"></head><body><p>café naïve</p></body></html>'.encode("cp1252"), None),
+        ("<html><body><p>café naïve</p></body></html>".encode("cp1252"), None),
+        (LATE_CP1252, None),
+        ("<html><body><p>café naïve</p></body></html>".encode("cp1252"), "windows-1252"),
+    ]
+    for data, encoding in cases:
+        assert both(data, encoding) == ("café naïve", "café naïve"), data[-60:]
+
+
+def test_utf8_split_across_chunks():
+    data = ("<html><body><p>" + "a" * (CHUNK_SIZE - 16) + "café</p></body></html>").encode("utf-8")
+    lxml_text, bs4_text = both(data)
+    assert lxml_text == bs4_text and lxml_text.endswith("café")
+
+
+def test_skip_tags_removed_before_container_search():
+    cases = [
+        b"<html><body><header><main>m</main></header><p>body</p></body></html>",
+        b"<html><body><template><p>t</p></template><p>x</p></body></html>",
+        b"<html><body><nav><article>a</article></nav><main>m</main></body></html>",
+    ]
+    for data in cases:
+        lxml_text, bs4_text = both(data)
+        assert lxml_text == bs4_text, (lxml_text, bs4_text)
+
+
+def test_empty_page():
+    assert both(b"") == ("", "")
+
+
+def test_unknown_engine():
+    try:
+        fetch_clean_text("https://example.org", engine="nope")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_encodings()
+    test_utf8_split_across_chunks()
+    test_skip_tags_removed_before_container_search()
+    test_empty_page()
+    test_unknown_engine()
+    print("clean text checks passed")
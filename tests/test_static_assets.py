@@ -0,0 +1,87 @@
+"""Checks ETag/304 handling and Content-Encoding negotiation for static files and pages.
+
+Run from the repo root: python -m tests.test_static_assets (or with pytest)
+"""
+import gzip
+import os
+import tempfile
+
+from fastapi import FastAPI, Request
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+
+from src.static_assets import PrecompressedStaticFiles, StaticPageCache
+
+SCRIPT = b"console.log('hello');\n" * 50
+PAGE = "<html><body><p>static page</p></body></html>"
+
+
+def make_client(root: str) -> TestClient:
+    os.makedirs(os.path.join(root, "static", "dist"))
+    os.makedirs(os.path.join(root, "templates"))
+    with open(os.path.join(root, "static", "dist", "app.abc123.js"), "wb") as f:
+        f.write(SCRIPT)
+    with open(os.path.join(root, "static", "dist", "app.abc123.js.gz"), "wb") as f:
+        f.write(gzip.compress(SCRIPT, mtime=0))
+    with open(os.path.join(root, "templates", "page.html"), "w") as f:
+        f.write(PAGE)
+
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=os.path.join(root, "static")), name="static")
+    pages = StaticPageCache(Jinja2Templates(directory=os.path.join(root, "templates")))
+
+    @app.get("/page")
+    async def page(request: Request):
+        return pages.response(request, "page.html")
+
+    return TestClient(app)
+
+
+def test_hashed_asset_negotiation():
+    with tempfile.TemporaryDirectory() as root:
+        client = make_client(root)
+        url = "/static/dist/app.abc123.js"
+
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert plain.status_code == 200
+        assert "content-encoding" not in plain.headers
+        assert "immutable" in plain.headers["cache-control"]
+
+        gz = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert gz.status_code == 200
+        assert gz.headers["content-encoding"] == "gzip"
+        assert gz.headers["content-type"] == plain.headers["content-type"]
+        assert gz.content == SCRIPT
+        assert gz.headers["etag"] != plain.headers["etag"]
+
+        # no .br was built, so the gzip variant is used
+        br = client.get(url, headers={"Accept-Encoding": "br, gzip"})
+        assert br.headers["content-encoding"] == "gzip"
+
+        again = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]})
+        assert again.status_code == 304
+
+        assert client.post(url).status_code == 405
+        assert client.get("/static/dist/" + "a" * 5000).status_code == 404
+        assert client.get("/static/dist/missing.js", headers={"Accept-Encoding": "gzip"}).status_code == 404
+
+
+def test_static_page_etags():
+    with tempfile.TemporaryDirectory() as root:
+        client = make_client(root)
+
+        plain = client.get("/page", headers={"Accept-Encoding": "identity"})
+        gz = client.get("/page", headers={"Accept-Encoding": "gzip"})
+        assert plain.text == gz.text == PAGE
+        assert gz.headers["content-encoding"] == "gzip"
+        assert plain.headers["etag"] != gz.headers["etag"]
+
+        for tag in (plain.headers["etag"], gz.headers["etag"], "W/" + gz.headers["etag"], "*"):
+            assert client.get("/page", headers={"If-None-Match": tag}).status_code == 304
+        assert client.get("/page", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+if __name__ == "__main__":
+    test_hashed_asset_negotiation()
+    test_static_page_etags()
+    print("static asset checks passed")